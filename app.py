@@ -1,10 +1,22 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
+import asyncio
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from datetime import datetime
 import os
 import time
+import shelve
+import threading
+import weakref
 
 # Konfiguration
 st.set_page_config(
@@ -34,9 +46,56 @@ BRANCH_FACTORS = {
     "Imbiss": 0.8,
     "Kiosk": 0.8
 }
+BRANCH_FACTOR_LOOKUP = pd.Series(BRANCH_FACTORS)
 
-# Styling
-st.markdown("""
+# Lead-Score v2.1: pro Faktor (Grenzen, Punkte je Bereich, rechte Grenze inklusive)
+LEAD_SCORE_FACTORS = {
+    # unbeantwortet %: 0 | bis 25 | bis 50 | bis 75 | darüber
+    "antwort": ([-np.inf, 0, 25, 50, 75, np.inf], [0, 10, 20, 28, 35], True),
+    # Rating: < 3.0 | < 3.5 | < 4.0 | < 4.5 | ab 4.5
+    "rating": ([-np.inf, 3.0, 3.5, 4.0, 4.5, np.inf], [25, 20, 15, 8, 0], False),
+    # Anzahl Reviews: < 5 | ab 5 | ab 10 | ab 31 | ab 100
+    "volumen": ([-np.inf, 5, 10, 31, 100, np.inf], [0, 5, 10, 15, 20], False),
+    # Tage seit letztem negativen Review: bis 7 | bis 30 | bis 90 | länger
+    "aktualitaet": ([-np.inf, 7, 30, 90, np.inf], [10, 7, 4, 0], True)
+}
+
+# Max. place_ids pro Outscraper Reviews-Request
+REVIEWS_BATCH_SIZE = 25
+
+# Unter dieser Review-Anzahl werden keine Reviews geholt (Volumen-Faktor ist ohnehin 0)
+MIN_REVIEWS_FOR_FETCH = 5
+
+# Disk-Cache für Reviews (pro place_id, 7 Tage gültig)
+REVIEW_CACHE_PATH = ".reviews.cache"
+REVIEW_CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Score-Kategorien: Grenzen (links inklusive), Labels und Zellen-CSS
+SCORE_BINS = [-np.inf, 30, 50, 70, np.inf]
+SCORE_LABELS = ["⚪ Low", "🔵 Cold", "🟡 Warm", "🔥 Hot"]
+SCORE_STYLES = [
+    '',
+    'background-color: #3B82F633; color: #3B82F6; font-weight: bold',
+    'background-color: #F59E0B33; color: #F59E0B; font-weight: bold',
+    'background-color: #22C55E33; color: #22C55E; font-weight: bold'
+]
+
+# Pain-Flags: Spalte -> Emoji
+PAIN_FLAGS = {
+    "flag_rep": "🚨",
+    "flag_resp": "⏰",
+    "flag_hv": "💰",
+    "flag_vol": "📊"
+}
+# Bit pro Flag und Anzeige-Label für jede der 16 Flag-Kombinationen
+PAIN_FLAG_BITS = (1 << np.arange(len(PAIN_FLAGS))).astype(np.uint8)
+PAIN_FLAG_LABELS = np.array([
+    " ".join(emoji for bit, emoji in enumerate(PAIN_FLAGS.values()) if mask >> bit & 1) or "-"
+    for mask in range(1 << len(PAIN_FLAGS))
+], dtype=object)
+
+# Styling (statisches HTML, wird bei jedem Rerun unverändert gesendet)
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -49,33 +108,6 @@ st.markdown("""
         color: #888;
         margin-top: 0;
     }
-    .score-hot { 
-        background-color: #22C55E33; 
-        color: #22C55E; 
-        font-weight: bold;
-        padding: 2px 8px;
-        border-radius: 4px;
-    }
-    .score-warm { 
-        background-color: #F59E0B33; 
-        color: #F59E0B; 
-        font-weight: bold;
-        padding: 2px 8px;
-        border-radius: 4px;
-    }
-    .score-cold { 
-        background-color: #3B82F633; 
-        color: #3B82F6; 
-        font-weight: bold;
-        padding: 2px 8px;
-        border-radius: 4px;
-    }
-    .score-none { 
-        background-color: #6B728033; 
-        color: #6B7280; 
-        padding: 2px 8px;
-        border-radius: 4px;
-    }
     .api-info {
         background: #1a1a1a;
         padding: 10px;
@@ -84,19 +116,90 @@ st.markdown("""
         margin: 10px 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
+API_INFO_HTML = """
+<div class="api-info">
+    <strong>🔌 Powered by Outscraper</strong><br>
+    <small>Echte Owner-Response-Daten • Mehr Ergebnisse • Multi-Plattform ready</small>
+</div>
+"""
 
-def search_businesses_outscraper(query: str, location: str, api_key: str, limit: int = 20) -> list:
+FOOTER_HTML = """
+<div style="text-align: center; color: #666; font-size: 0.8rem;">
+    ReviewHunter by ReviewGuard | <a href="https://review-guard.app" target="_blank">review-guard.app</a><br>
+    <small>Powered by Outscraper API</small>
+</div>
+"""
+
+# Sidebar-Legenden
+SCORE_LEGEND_MD = """
+**70+:** 🔥 Hot Lead  
+**50-69:** 🟡 Warm Lead  
+**30-49:** 🔵 Cold Lead  
+**0-29:** ⚪ Kein Lead
+"""
+
+PAIN_FLAG_LEGEND_MD = """
+🚨 Rating < 4.0  
+⏰ >50% unbeantwortet  
+💰 High-Value Branche  
+📊 50+ Reviews
+"""
+
+
+def _json_loads(content: bytes):
+    """JSON parsen - orjson wenn installiert (deutlich schneller), sonst stdlib"""
+    
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _unwrap_outscraper(result) -> list:
+    """Datenliste einer Outscraper-Antwort: {"status": ..., "data": [...]} oder direkt die Liste"""
+    
+    data = result.get("data") if isinstance(result, dict) else result
+    if not isinstance(data, list):
+        raise ValueError(f"Unerwartete API-Antwort: {type(result).__name__} ohne Datenliste")
+    return data
+
+
+@st.cache_resource
+def _session() -> requests.Session:
     """
-    Sucht Businesses via Outscraper Google Maps API
-    Liefert mehr Ergebnisse als Google Places API
+    Geteilte HTTP-Session für alle Outscraper-Requests
+    Connection Pooling (Keep-Alive) + Retries bei Verbindungsfehlern und 429/5xx
+    Keine Retries bei Read-Timeouts (sonst bis zu 4x 120s Wartezeit und doppelt abgerechnete Suchen)
+    """
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            read=False,  # Read-Timeout direkt weiterwerfen (requests.exceptions.ReadTimeout)
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False
+        )
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _search_businesses_cached(query: str, location: str, _api_key: str, limit: int = 20) -> list:
+    """
+    Sucht Businesses via Outscraper Google Maps API (gecacht auf query, location, limit)
+    Fehler werden als Exception geworfen, damit sie nicht im Cache landen
     """
     
     url = "https://api.app.outscraper.com/maps/search-v3"
     
     headers = {
-        "X-API-KEY": api_key
+        "X-API-KEY": _api_key
     }
     
     # Outscraper Format: "query, location"
@@ -107,60 +210,75 @@ def search_businesses_outscraper(query: str, location: str, api_key: str, limit:
         "region": "DE"
     }
     
-    try:
-        response = requests.get(url, headers=headers, params=params, timeout=120)
+    response = _session().get(url, headers=headers, params=params, timeout=120)
+    
+    # 202 = Async/Pending - müssen pollen
+    if response.status_code == 202:
+        result = _json_loads(response.content)
+        results_url = result.get("results_location")
         
-        # 202 = Async/Pending - müssen pollen
-        if response.status_code == 202:
-            result = response.json()
-            results_url = result.get("results_location")
-            
-            if results_url:
-                # Polling - warte auf Ergebnisse
-                for attempt in range(30):  # Max 30 Versuche (60 Sekunden)
-                    time.sleep(2)
-                    poll_response = requests.get(results_url, headers=headers, timeout=30)
-                    
-                    if poll_response.status_code == 200:
-                        poll_data = poll_response.json()
-                        
-                        # Check ob fertig
-                        if poll_data.get("status") == "Success" or isinstance(poll_data, list):
-                            data = poll_data.get("data", poll_data) if isinstance(poll_data, dict) else poll_data
-                            if data and len(data) > 0:
-                                items = data[0] if isinstance(data[0], list) else data
-                                return [b for b in items if isinstance(b, dict) and b.get('name')]
-                            return []
-                    elif poll_response.status_code == 202:
-                        continue  # Noch nicht fertig
-                    else:
-                        break
+        if results_url:
+            # Polling - warte auf Ergebnisse
+            for attempt in range(30):  # Max 30 Versuche (60 Sekunden)
+                time.sleep(2)
+                poll_response = _session().get(results_url, headers=headers, timeout=30)
                 
-                st.warning("⏱️ Timeout beim Warten auf Ergebnisse")
-                return []
-        
-        elif response.status_code == 200:
-            result = response.json()
-            if result and len(result) > 0:
-                data = result[0] if isinstance(result[0], list) else result
-                return [b for b in data if isinstance(b, dict) and b.get('name')]
-            return []
-        else:
-            st.error(f"API Status: {response.status_code} - {response.text[:200]}")
-            return []
+                if poll_response.status_code == 200:
+                    poll_data = _json_loads(poll_response.content)
+                    
+                    # Check ob fertig
+                    if isinstance(poll_data, list) or poll_data.get("status") == "Success":
+                        data = poll_data.get("data", poll_data) if isinstance(poll_data, dict) else poll_data
+                        if data and len(data) > 0:
+                            items = data[0] if isinstance(data[0], list) else data
+                            return [b for b in items if isinstance(b, dict) and b.get('name')]
+                        return []
+                elif poll_response.status_code == 202:
+                    continue  # Noch nicht fertig
+                else:
+                    break
             
+            raise TimeoutError("⏱️ Timeout beim Warten auf Ergebnisse")
+        raise ValueError("API Status 202 ohne results_location")
+    
+    elif response.status_code == 200:
+        result = _json_loads(response.content)
+        if result and len(result) > 0:
+            data = result[0] if isinstance(result[0], list) else result
+            return [b for b in data if isinstance(b, dict) and b.get('name')]
+        return []
+    else:
+        raise requests.exceptions.HTTPError(f"API Status: {response.status_code} - {response.text[:200]}")
+
+
+def search_businesses_outscraper(query: str, location: str, api_key: str, limit: int = 20) -> list:
+    """
+    Sucht Businesses via Outscraper Google Maps API
+    Liefert mehr Ergebnisse als Google Places API
+    """
+    
+    try:
+        return _search_businesses_cached(query, location, api_key, limit)
     except requests.exceptions.Timeout:
         st.error("⏱️ Timeout - Anfrage dauerte zu lange.")
         return []
+    except TimeoutError as e:
+        st.warning(str(e))
+        return []
+    except requests.exceptions.HTTPError as e:
+        st.error(str(e))
+        return []
     except Exception as e:
         st.error(f"API Fehler: {type(e).__name__}: {str(e)}")
         return []
 
 
-def get_reviews_outscraper(place_id: str, api_key: str, reviews_limit: int = 20) -> list:
+async def get_reviews_batch(client: httpx.AsyncClient, place_ids: list, api_key: str,
+                            reviews_limit: int = 20) -> list:
     """
-    Holt Reviews für ein Business via Outscraper
-    Inkludiert owner_response Feld!
+    Holt Reviews für mehrere Businesses in einem Request via Outscraper (async)
+    Mehrere query-Parameter -> eine Reviews-Liste pro place_id, gleiche Reihenfolge
+    Fehler werden als Exception geworfen, damit sie nicht im Cache landen
     """
     
     url = "https://api.app.outscraper.com/maps/reviews-v3"
@@ -169,174 +287,321 @@ def get_reviews_outscraper(place_id: str, api_key: str, reviews_limit: int = 20)
         "X-API-KEY": api_key
     }
     
-    params = {
-        "query": place_id,
-        "reviewsLimit": reviews_limit,
-        "language": "de",
-        "sort": "newest"
-    }
-    
-    try:
-        response = requests.get(url, headers=headers, params=params, timeout=60)
+    params = [("query", place_id) for place_id in place_ids] + [
+        ("reviewsLimit", reviews_limit),
+        ("async", "false"),
+        ("language", "de"),
+        ("sort", "newest")
+    ]
+    
+    def extract(result) -> list:
+        # Outscraper liefert pro Query ein Place-Objekt mit reviews_data - andere Form = Fehler, nicht auffüllen
+        data = _unwrap_outscraper(result)
+        if len(data) != len(place_ids):
+            raise ValueError(f"Unerwartete API-Antwort: {len(data)} Einträge für {len(place_ids)} place_ids")
+        if not all(isinstance(place_data, dict) for place_data in data):
+            raise ValueError("Unerwartete API-Antwort: Einträge sind keine Place-Objekte")
+        return [place_data.get("reviews_data") or [] for place_data in data]
+    
+    response = await client.get(url, headers=headers, params=params)
+    status = response.status_code
+    result = _json_loads(response.content) if status in (200, 202) else None
+    
+    # 202 = Async - pollen
+    if status == 202:
+        results_url = result.get("results_location")
         
-        # 202 = Async - pollen
-        if response.status_code == 202:
-            result = response.json()
-            results_url = result.get("results_location")
-            
-            if results_url:
-                for attempt in range(20):  # Max 40 Sekunden
-                    time.sleep(2)
-                    poll_response = requests.get(results_url, headers=headers, timeout=30)
-                    
-                    if poll_response.status_code == 200:
-                        poll_data = poll_response.json()
-                        
-                        if poll_data.get("status") == "Success" or isinstance(poll_data, list):
-                            data = poll_data.get("data", poll_data) if isinstance(poll_data, dict) else poll_data
-                            if data and len(data) > 0:
-                                place_data = data[0] if isinstance(data[0], dict) else {}
-                                return place_data.get("reviews_data", []) or []
-                        return []
-                    elif poll_response.status_code == 202:
-                        continue
-                    else:
-                        break
-            return []
-        
-        elif response.status_code == 200:
-            result = response.json()
-            if result and len(result) > 0:
-                place_data = result[0] if isinstance(result[0], dict) else {}
-                return place_data.get("reviews_data", []) or []
-            return []
-        else:
-            return []
+        if results_url:
+            for attempt in range(30):  # Max 60 Sekunden
+                await asyncio.sleep(2)
+                poll_response = await client.get(results_url, headers=headers)
+                poll_status = poll_response.status_code
+                poll_data = _json_loads(poll_response.content) if poll_status == 200 else None
+                
+                if poll_status == 200:
+                    if isinstance(poll_data, list) or poll_data.get("status") == "Success":
+                        return extract(poll_data)
+                elif poll_status == 202:
+                    continue
+                else:
+                    break
             
-    except:
-        return []
+            raise TimeoutError("⏱️ Timeout beim Warten auf Reviews")
+        raise ValueError("API Status 202 ohne results_location")
+    
+    elif status == 200:
+        return extract(result)
+    else:
+        raise httpx.HTTPStatusError(
+            f"API Status: {status} - {response.text[:200]}",
+            request=response.request,
+            response=response
+        )
 
 
-def analyze_reviews_outscraper(reviews: list) -> dict:
+def _close_async_runtime(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient):
+    """Schließt den httpx-Client auf seinem Loop und stoppt danach den Loop-Thread (wartet nicht)"""
+    
+    async def close():
+        try:
+            await client.aclose()
+        finally:
+            loop.stop()
+    
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(close(), loop)
+
+
+@st.cache_resource
+def _async_runtime():
+    """
+    Dauerhafter Event-Loop in eigenem Thread + geteilter httpx-Client (HTTP/2)
+    Parallele Batches laufen gemultiplext über eine Verbindung, die auch zwischen Suchen offen bleibt
+    Gibt die Funktion zurück, die Coroutinen darauf ausführt - fällt sie aus dem Cache
+    (Cache leeren, Eviction), werden Client und Loop-Thread per weakref.finalize beendet
     """
-    Analysiert Reviews auf Owner Responses
+    
+    loop = asyncio.new_event_loop()
+    
+    def serve():
+        loop.run_forever()
+        loop.close()
+    
+    threading.Thread(target=serve, daemon=True).start()
+    
+    async def create_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(120),
+            limits=httpx.Limits(max_connections=16, keepalive_expiry=60)
+        )
+    
+    client = asyncio.run_coroutine_threadsafe(create_client(), loop).result()
+    
+    def run(coro_factory):
+        return asyncio.run_coroutine_threadsafe(coro_factory(client), loop).result()
+    
+    weakref.finalize(run, _close_async_runtime, loop, client)
+    return run
+
+
+def run_async(coro_factory):
+    """Führt eine Coroutine auf dem geteilten Event-Loop aus und wartet auf das Ergebnis"""
+    
+    return _async_runtime()(coro_factory)
+
+
+async def fetch_all_reviews(client: httpx.AsyncClient, place_ids: list, api_key: str,
+                            limit: int = 20, concurrency: int = 8) -> list:
+    """
+    Holt Reviews für mehrere Businesses, gebündelt zu REVIEWS_BATCH_SIZE place_ids pro Request
+    Alle Requests laufen über den geteilten Client (Keep-Alive), Semaphore begrenzt die Parallelität
+    """
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    batches = [place_ids[i:i + REVIEWS_BATCH_SIZE] for i in range(0, len(place_ids), REVIEWS_BATCH_SIZE)]
+    
+    async def fetch(batch: list) -> list:
+        async with semaphore:
+            return await get_reviews_batch(client, batch, api_key, reviews_limit=limit)
+    
+    # Alle Batches zu Ende laufen lassen, dann den ersten Fehler weiterwerfen
+    results = await asyncio.gather(*(fetch(batch) for batch in batches), return_exceptions=True)
+    
+    reviews = []
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+        reviews.extend(result)
+    return reviews
+
+
+@st.cache_resource
+def _review_cache() -> tuple:
+    """
+    Persistenter Review-Cache pro place_id (überlebt Neustarts der App)
+    Shelve ist nicht thread-safe, daher mit Lock
+    Abgelaufene Einträge werden beim Öffnen einmal entfernt
+    """
+    
+    cache = shelve.open(REVIEW_CACHE_PATH)
+    now = time.time()
+    
+    stale = [place_id for place_id, (fetched_at, _, _) in cache.items() if now - fetched_at >= REVIEW_CACHE_MAX_AGE]
+    for place_id in stale:
+        del cache[place_id]
+    cache.sync()
+    
+    return cache, threading.Lock()
+
+
+def _disk_cache_get(place_ids: list, reviews_limit: int) -> dict:
+    """
+    Reviews aus dem Disk-Cache, nur Einträge jünger als REVIEW_CACHE_MAX_AGE mit genug Reviews
+    Abgelaufene Einträge werden dabei gelöscht
+    """
+    
+    cache, lock = _review_cache()
+    now = time.time()
+    hits = {}
+    expired = False
+    
+    with lock:
+        for place_id in place_ids:
+            entry = cache.get(place_id)
+            if not entry:
+                continue
+            fetched_at, cached_limit, reviews = entry
+            if now - fetched_at >= REVIEW_CACHE_MAX_AGE:
+                del cache[place_id]
+                expired = True
+            elif cached_limit >= reviews_limit:
+                hits[place_id] = reviews[:reviews_limit]
+        if expired:
+            cache.sync()
+    
+    return hits
+
+
+def _disk_cache_put(reviews_by_place: dict, reviews_limit: int):
+    """Schreibt frisch geholte Reviews in den Disk-Cache"""
+    
+    cache, lock = _review_cache()
+    now = time.time()
+    
+    with lock:
+        for place_id, reviews in reviews_by_place.items():
+            cache[place_id] = (now, reviews_limit, reviews)
+        cache.sync()
+
+
+@st.cache_data(ttl=1800, max_entries=256, show_spinner=False)
+def _fetch_reviews_cached(place_ids: tuple, _api_key: str, reviews_limit: int = 20) -> dict:
+    """
+    Reviews für mehrere Businesses, gecacht auf (place_ids, reviews_limit)
+    Holt nur place_ids, die nicht schon im Disk-Cache liegen
+    Gibt ein Dict place_id -> Reviews zurück, Fehler werden geworfen (nicht gecacht)
+    Leere Ergebnisse fehlen im Dict: geholt wird erst ab MIN_REVIEWS_FOR_FETCH, leer heißt also unbekannt
+    """
+    
+    reviews_by_place = _disk_cache_get(place_ids, reviews_limit)
+    missing = [place_id for place_id in place_ids if place_id not in reviews_by_place]
+    
+    if missing:
+        reviews = run_async(lambda client: fetch_all_reviews(client, missing, _api_key, limit=reviews_limit))
+        fetched = {place_id: place_reviews for place_id, place_reviews in zip(missing, reviews) if place_reviews}
+        _disk_cache_put(fetched, reviews_limit)
+        reviews_by_place.update(fetched)
+    
+    return reviews_by_place
+
+
+def get_reviews(place_ids: tuple, api_key: str, reviews_limit: int = 20) -> dict:
+    """
+    Reviews für mehrere Businesses (siehe _fetch_reviews_cached)
+    Bei Fehlern Warnung und nur die Treffer aus dem Disk-Cache, der Rest gilt als unbekannt
+    """
+    
+    try:
+        return _fetch_reviews_cached(place_ids, api_key, reviews_limit)
+    except TimeoutError as e:
+        st.warning(str(e))
+    except Exception as e:
+        st.warning(f"⚠️ Reviews konnten nicht geladen werden: {type(e).__name__}: {str(e)}")
+    return _disk_cache_get(place_ids, reviews_limit)  # Fallback: nur was schon im Disk-Cache liegt
+
+
+def analyze_reviews_outscraper(reviews_per_business: list) -> pd.DataFrame:
+    """
+    Analysiert Reviews aller Businesses auf einmal auf Owner Responses
     Outscraper liefert owner_response Feld direkt!
+    Eine Zeile pro Business (gleiche Reihenfolge), ohne Reviews: 100% unbeantwortet
+    None = Reviews nicht geholt: Antwortverhalten unbekannt, unanswered_pct NaN
     """
     
-    if not reviews:
-        return {
-            "total": 0,
-            "answered": 0,
-            "unanswered": 0,
-            "unanswered_pct": 100,
-            "last_negative_days": 999
-        }
+    n = len(reviews_per_business)
+    known = np.fromiter((reviews is not None for reviews in reviews_per_business), dtype=bool, count=n)
+    reviews_per_business = [reviews or [] for reviews in reviews_per_business]
+    totals = np.fromiter((len(reviews) for reviews in reviews_per_business), dtype=np.int64, count=n)
+    
+    # Alle Reviews flach hintereinander, business = Index des zugehörigen Businesses
+    flat = [review for reviews in reviews_per_business for review in reviews]
+    business = np.repeat(np.arange(n), totals)
+    
+    # Nur die benötigten Felder in typisierte Arrays projizieren (ein Durchgang pro Feld)
+    # Outscraper Feld heißt "owner_answer" - leere Strings zählen nicht als Antwort
+    has_answer = np.fromiter(
+        (bool(r.get("owner_answer") or r.get("owner_response") or r.get("response_from_owner_text")) for r in flat),
+        dtype=bool,
+        count=len(flat)
+    )
+    ratings = np.fromiter((r.get("review_rating", 5) or 0 for r in flat), dtype=np.int8, count=len(flat))
     
-    total = len(reviews)
-    answered = 0
-    last_negative_days = 999
+    answered = np.bincount(business[has_answer], minlength=n)
     
-    now = datetime.now()
+    # Rating checken (1-3 = negativ), fehlendes Rating zählt nicht als negativ
+    negative = (ratings > 0) & (ratings <= 3)
     
-    for review in reviews:
-        # Outscraper Feld heißt "owner_answer"
-        owner_answer = review.get("owner_answer") or review.get("owner_response") or review.get("response_from_owner_text")
-        if owner_answer:
-            answered += 1
-        
-        # Rating checken (1-3 = negativ)
-        rating = review.get("review_rating", 5)
-        if rating and rating <= 3:
-            review_date_str = review.get("review_datetime_utc") or review.get("review_date")
-            if review_date_str:
-                try:
-                    if isinstance(review_date_str, str):
-                        review_date = datetime.fromisoformat(review_date_str.replace("Z", "+00:00"))
-                        days_ago = (now - review_date.replace(tzinfo=None)).days
-                        if days_ago < last_negative_days:
-                            last_negative_days = days_ago
-                except:
-                    pass
-    
-    unanswered = total - answered
-    unanswered_pct = (unanswered / total * 100) if total > 0 else 0
-    
-    return {
-        "total": total,
+    last_negative_days = np.full(n, 999, dtype=np.int64)
+    if negative.any():
+        # Ein Parse-Durchgang für alle negativen Reviews, ungültige Strings -> NaT; Vergleich in UTC
+        negative_idx = np.flatnonzero(negative)
+        date_str = [flat[i].get("review_datetime_utc") or flat[i].get("review_date") for i in negative_idx]
+        review_dates = pd.to_datetime(date_str, format="ISO8601", errors="coerce", utc=True)
+        days_ago = pd.Series((pd.Timestamp.now(tz="UTC") - review_dates).days)
+        min_days = days_ago.groupby(business[negative_idx]).min().dropna()
+        last_negative_days[min_days.index] = np.minimum(min_days.to_numpy(), 999)
+    
+    unanswered = totals - answered
+    unanswered_pct = np.divide(unanswered, totals, out=np.ones(n), where=totals > 0) * 100
+    unanswered_pct[~known] = np.nan
+    
+    return pd.DataFrame({
+        "total": totals,
         "answered": answered,
         "unanswered": unanswered,
         "unanswered_pct": unanswered_pct,
         "last_negative_days": last_negative_days
-    }
+    })
+
+
+def _factor_points(factor: str, values: np.ndarray) -> np.ndarray:
+    """Punkte eines Score-Faktors: ein pd.cut über LEAD_SCORE_FACTORS[factor]"""
+    
+    bins, points, right = LEAD_SCORE_FACTORS[factor]
+    bucket = pd.cut(values, bins=bins, labels=False, right=right).astype(int)
+    return np.take(points, bucket)
 
 
-def calculate_lead_score(rating: float, review_count: int, unanswered_pct: float, 
-                         last_negative_days: int, branche: str) -> tuple:
+def calculate_lead_scores(rating, review_count, unanswered_pct, last_negative_days, branche) -> pd.DataFrame:
     """
-    Berechnet Lead-Score v2.1 (0-100+)
+    Berechnet Lead-Score v2.1 (0-100+) für alle Businesses auf einmal
+    Parameter sind gleich lange Listen/Arrays, Rückgabe ist der Breakdown pro Business
     """
     
-    # Faktor 1: Antwortverhalten (max 35 Punkte)
-    f1 = 0
-    if unanswered_pct == 0:
-        f1 = 0
-    elif unanswered_pct <= 25:
-        f1 = 10
-    elif unanswered_pct <= 50:
-        f1 = 20
-    elif unanswered_pct <= 75:
-        f1 = 28
-    else:
-        f1 = 35
-    
-    # Faktor 2: Rating-Problem (max 25 Punkte)
-    f2 = 0
-    if rating:
-        if rating < 3.0:
-            f2 = 25
-        elif rating < 3.5:
-            f2 = 20
-        elif rating < 4.0:
-            f2 = 15
-        elif rating < 4.5:
-            f2 = 8
-        else:
-            f2 = 0
-    else:
-        f2 = 12
+    rating = np.nan_to_num(np.asarray(rating, dtype=float))  # None / kein Rating -> 0
+    review_count = np.asarray(review_count, dtype=float)
+    unanswered_pct = np.asarray(unanswered_pct, dtype=float)
+    last_negative_days = np.asarray(last_negative_days, dtype=float)
     
-    if review_count < 10:
-        f2 = int(f2 * 0.5)
+    # Faktor 1: Antwortverhalten (max 35 Punkte), unbekannt (NaN) -> 0 Punkte
+    f1 = np.where(np.isnan(unanswered_pct), 0, _factor_points("antwort", np.nan_to_num(unanswered_pct)))
+    
+    # Faktor 2: Rating-Problem (max 25 Punkte), ohne Rating 12 Punkte
+    f2 = np.where(rating == 0, 12, _factor_points("rating", rating))
+    f2 = np.where(review_count < 10, f2 // 2, f2)
     
     # Faktor 3: Volumen (max 20 Punkte)
-    f3 = 0
-    if review_count >= 100:
-        f3 = 20
-    elif review_count >= 31:
-        f3 = 15
-    elif review_count >= 10:
-        f3 = 10
-    elif review_count >= 5:
-        f3 = 5
-    else:
-        f3 = 0
+    f3 = _factor_points("volumen", review_count)
     
     # Faktor 4: Aktualität (max 10 Punkte)
-    f4 = 0
-    if last_negative_days <= 7:
-        f4 = 10
-    elif last_negative_days <= 30:
-        f4 = 7
-    elif last_negative_days <= 90:
-        f4 = 4
-    else:
-        f4 = 0
+    f4 = _factor_points("aktualitaet", last_negative_days)
     
     raw_score = f1 + f2 + f3 + f4
-    branch_factor = BRANCH_FACTORS.get(branche, 1.0)
-    final_score = round(raw_score * branch_factor)
+    branch_factor = pd.Series(branche).map(BRANCH_FACTOR_LOOKUP).fillna(1.0).to_numpy()
+    final_score = np.round(raw_score * branch_factor).astype(np.int16)
     
-    breakdown = {
+    return pd.DataFrame({
         "antwort": f1,
         "rating": f2,
         "volumen": f3,
@@ -344,44 +609,142 @@ def calculate_lead_score(rating: float, review_count: int, unanswered_pct: float
         "raw": raw_score,
         "factor": branch_factor,
         "final": final_score
-    }
-    
-    return final_score, breakdown
+    })
 
 
-def get_pain_flags(rating: float, unanswered_pct: float, branch_factor: float, review_count: int) -> list:
-    """Berechnet Pain-Flags für ein Business"""
-    
-    flags = []
+def get_pain_flags(rating, unanswered_pct, branch_factor, review_count) -> pd.DataFrame:
+    """
+    Berechnet Pain-Flags für alle Businesses auf einmal
+    Eine Bool-Spalte pro Flag (siehe PAIN_FLAGS)
+    """
     
-    if rating and rating < 4.0:
-        flags.append("🚨")
+    rating = np.nan_to_num(np.asarray(rating, dtype=float))  # kein Rating -> kein Flag
     
-    if unanswered_pct > 50:
-        flags.append("⏰")
+    return pd.DataFrame({
+        "flag_rep": (rating > 0) & (rating < 4.0),
+        "flag_resp": np.asarray(unanswered_pct, dtype=float) > 50,  # unbekannt (NaN) -> kein Flag
+        "flag_hv": np.asarray(branch_factor, dtype=float) >= 1.2,
+        "flag_vol": np.asarray(review_count, dtype=float) >= 50
+    })
+
+
+def format_pain_flags(flags: pd.DataFrame) -> np.ndarray:
+    """
+    Baut die Flags-Anzeige ("🚨 ⏰ ...") aus den Bool-Spalten
+    Flags -> Bitmaske pro Business -> Lookup in den vorberechneten PAIN_FLAG_LABELS
+    """
     
-    if branch_factor >= 1.2:
-        flags.append("💰")
+    bitmask = flags[list(PAIN_FLAGS)].to_numpy().astype(np.uint8) @ PAIN_FLAG_BITS
+    return PAIN_FLAG_LABELS[bitmask]
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """
+    CSV-Export (ohne interne Flag-Spalten), gecacht auf den Inhalt von df
+    Unbeantwortet % wie in der Anzeige als "67%", fehlende Werte als "-"
+    """
     
-    if review_count >= 50:
-        flags.append("📊")
+    export = df.drop(columns=list(PAIN_FLAGS))
+    export["Unbeantwortet %"] = export["Unbeantwortet %"].map("{:.0f}%".format, na_action="ignore")
+    return export.to_csv(index=False, na_rep="-").encode('utf-8')
+
+
+def get_score_categories(scores) -> tuple:
+    """
+    Kategorie-Label und Zellen-CSS für alle Scores aus einem einzigen pd.cut
+    Schwellen: 70+ Hot, 50-69 Warm, 30-49 Cold, 0-29 Low
+    """
     
-    return flags
+    level = pd.cut(scores, bins=SCORE_BINS, labels=False, right=False).astype(int)
+    return np.take(SCORE_LABELS, level), np.take(SCORE_STYLES, level)
 
 
-def get_score_category(score: int) -> tuple:
-    if score >= 70:
-        return "🔥 Hot", "score-hot"
-    elif score >= 50:
-        return "🟡 Warm", "score-warm"
-    elif score >= 30:
-        return "🔵 Cold", "score-cold"
-    else:
-        return "⚪ Low", "score-none"
+def render_results(df: pd.DataFrame, score_styles, branche: str, location: str):
+    """
+    Zeigt Metriken, Ergebnistabelle und CSV-Export für ein fertiges Ergebnis-df
+    """
+    
+    hot_mask = df["Lead-Score"].to_numpy() >= 70
+    
+    # Metriken - beide Mittelwerte in einer Aggregation
+    averages = df.agg({"Rating": "mean", "Lead-Score": "mean"})
+    avg_rating = 0 if pd.isna(averages["Rating"]) else averages["Rating"]  # kein Rating -> 0
+    
+    st.divider()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Businesses", len(df))
+    with col2:
+        st.metric("Ø Rating", f"{avg_rating:.1f} ⭐")
+    with col3:
+        st.metric("🔥 Hot Leads", int(hot_mask.sum()))
+    with col4:
+        st.metric("Ø Score", f"{averages['Lead-Score']:.0f}")
+    
+    st.divider()
+    
+    flag_counts = df[list(PAIN_FLAGS)].sum().astype(int)
+    reputation_risk, response_problem, high_value, high_volume = flag_counts.tolist()
+    
+    flag_cols = st.columns(4)
+    with flag_cols[0]:
+        st.metric("🚨 Reputation Risk", reputation_risk)
+    with flag_cols[1]:
+        st.metric("⏰ Response Problem", response_problem)
+    with flag_cols[2]:
+        st.metric("💰 High Value", high_value)
+    with flag_cols[3]:
+        st.metric("📊 High Volume", high_volume)
+    
+    st.divider()
+    
+    st.subheader("📋 Ergebnisse")
+    
+    st.markdown("🔥 Hot (70+) · 🟡 Warm (50-69) · 🔵 Cold (30-49) · ⚪ Low (0-29)")
+    
+    display_cols = ["Name", "Rating", "Reviews", "Beantwortet", "Unbeantwortet %", 
+                  "Lead-Score", "Kategorie", "Flags", "Telefon"]
+    
+    # Formatierung über den Styler - column_config kennt keinen Platzhalter für fehlende Werte
+    styled_df = (
+        df[display_cols].style
+        .apply(lambda col: score_styles, subset=['Lead-Score'])
+        .format({"Rating": "{:.1f} ⭐", "Unbeantwortet %": "{:.0f}%"}, na_rep="-")
+    )
+    st.dataframe(styled_df, use_container_width=True, hide_index=True)
+    
+    st.divider()
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        csv = to_csv_bytes(df)
+        st.download_button(
+            label="📥 Als CSV exportieren",
+            data=csv,
+            file_name=f"reviewhunter_{branche.lower()}_{location.lower()}_{datetime.now().strftime('%Y%m%d')}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+    
+    with col2:
+        hot_df = df[hot_mask]
+        if len(hot_df) > 0:
+            hot_csv = to_csv_bytes(hot_df)
+            st.download_button(
+                label=f"🔥 Nur Hot Leads ({len(hot_df)})",
+                data=hot_csv,
+                file_name=f"reviewhunter_HOT_{branche.lower()}_{location.lower()}_{datetime.now().strftime('%Y%m%d')}.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
 
 
 # ============== MAIN APP ==============
 
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 st.markdown('<p class="main-header">🎯 ReviewHunter</p>', unsafe_allow_html=True)
 st.markdown('<p class="sub-header">Finde Businesses mit schlechtem Review-Management</p>', unsafe_allow_html=True)
 
@@ -406,22 +769,12 @@ with st.sidebar:
     st.divider()
     
     st.header("📊 Lead-Score")
-    st.markdown("""
-    **70+:** 🔥 Hot Lead  
-    **50-69:** 🟡 Warm Lead  
-    **30-49:** 🔵 Cold Lead  
-    **0-29:** ⚪ Kein Lead
-    """)
+    st.markdown(SCORE_LEGEND_MD)
     
     st.divider()
     
     st.header("🏷️ Pain-Flags")
-    st.markdown("""
-    🚨 Rating < 4.0  
-    ⏰ >50% unbeantwortet  
-    💰 High-Value Branche  
-    📊 50+ Reviews
-    """)
+    st.markdown(PAIN_FLAG_LEGEND_MD)
 
 # Hauptbereich
 col1, col2 = st.columns([1, 1])
@@ -437,24 +790,21 @@ with col2:
     location = st.text_input("Stadt / Region", value="Bochum")
 
 # Branchen-Info
-branch_factor = BRANCH_FACTORS.get(branche, 1.0)
+branch_factor = BRANCH_FACTOR_LOOKUP.get(branche, 1.0)
 if branch_factor > 1.0:
     st.info(f"💰 {branche}: Multiplikator **×{branch_factor}** (High-Value)")
 elif branch_factor < 1.0:
     st.info(f"📉 {branche}: Multiplikator **×{branch_factor}**")
 
 # API Info
-st.markdown("""
-<div class="api-info">
-    <strong>🔌 Powered by Outscraper</strong><br>
-    <small>Echte Owner-Response-Daten • Mehr Ergebnisse • Multi-Plattform ready</small>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(API_INFO_HTML, unsafe_allow_html=True)
 
 # Suchen Button
+search_key = (branche, location, result_limit, reviews_per_business)
 if st.button("🔍 Businesses suchen", type="primary", use_container_width=True):
     
     if not OUTSCRAPER_API_KEY:
+        st.session_state.pop("last_key", None)
         st.error("Bitte API Key eingeben!")
     else:
         # Phase 1: Businesses finden
@@ -467,165 +817,108 @@ if st.button("🔍 Businesses suchen", type="primary", use_container_width=True)
             )
         
         if not businesses:
+            st.session_state.pop("last_key", None)
             st.warning("Keine Ergebnisse gefunden. Versuche eine andere Suche.")
         else:
             st.success(f"✅ {len(businesses)} Businesses gefunden!")
+
+            # Review-Anzahl einmal pro Business - dieselbe Zahl für Sortierung, Fetch-Filter und Score
+            n = len(businesses)
+            review_counts = np.fromiter(
+                ((b.get("reviews", b.get("reviews_count", 0)) or 0) for b in businesses),
+                dtype=np.int32,
+                count=n
+            )
             
-            # Phase 2: Reviews analysieren
-            results = []
+            # Meiste Reviews zuerst - die aussagekräftigsten Leads stehen vorne (stabil wie sorted)
+            order = np.argsort(-review_counts, kind="stable")
+            businesses = [businesses[i] for i in order]
+            review_counts = review_counts[order]
             
-            progress_bar = st.progress(0)
-            status_text = st.empty()
+            # Phase 2: Reviews parallel holen (nur Businesses mit genug Reviews)
+            # Sortiert + ohne Duplikate: jede place_id nur einmal holen, Cache-Key unabhängig von der Reihenfolge
+            place_ids = sorted({
+                b.get("place_id") for b, count in zip(businesses, review_counts)
+                if b.get("place_id") and count >= MIN_REVIEWS_FOR_FETCH
+            })
             
-            for i, business in enumerate(businesses):
-                name = business.get("name", "Unknown")
-                status_text.text(f"📊 Analysiere {i+1}/{len(businesses)}: {name}")
-                progress_bar.progress((i + 1) / len(businesses))
-                
-                place_id = business.get("place_id", "")
-                address = business.get("full_address", business.get("address", ""))
-                rating = business.get("rating", 0)
-                review_count = business.get("reviews", business.get("reviews_count", 0))
-                maps_url = business.get("google_maps_url", business.get("link", ""))
-                phone = business.get("phone", "")
-                website = business.get("site", business.get("website", ""))
-                
-                # Reviews holen
-                reviews = []
-                if place_id and review_count and review_count > 0:
-                    reviews = get_reviews_outscraper(
-                        place_id, 
-                        OUTSCRAPER_API_KEY, 
-                        reviews_limit=reviews_per_business
-                    )
-                    time.sleep(0.3)
-                
-                analysis = analyze_reviews_outscraper(reviews)
-                
-                lead_score, breakdown = calculate_lead_score(
-                    rating, 
-                    review_count or 0, 
-                    analysis["unanswered_pct"],
-                    analysis["last_negative_days"],
-                    branche
+            with st.spinner(f"💬 Lade Reviews für {len(place_ids)} Businesses..."):
+                reviews_by_place = get_reviews(
+                    tuple(place_ids),
+                    OUTSCRAPER_API_KEY,
+                    reviews_limit=reviews_per_business
                 )
-                
-                pain_flags = get_pain_flags(
-                    rating,
-                    analysis["unanswered_pct"],
-                    breakdown["factor"],
-                    review_count or 0
-                )
-                
-                category, _ = get_score_category(lead_score)
-                
-                results.append({
-                    "Name": name,
-                    "Rating": rating or "-",
-                    "Reviews": review_count or 0,
-                    "Beantwortet": f"{analysis['answered']}/{analysis['total']}",
-                    "Unbeantwortet %": f"{analysis['unanswered_pct']:.0f}%",
-                    "Lead-Score": lead_score,
-                    "Kategorie": category,
-                    "Flags": " ".join(pain_flags) if pain_flags else "-",
-                    "Telefon": phone or "-",
-                    "Website": website or "-",
-                    "Adresse": address,
-                    "Google Maps": maps_url
-                })
-            
-            progress_bar.empty()
-            status_text.empty()
-            
-            df = pd.DataFrame(results)
-            df = df.sort_values("Lead-Score", ascending=False)
-            
-            # Metriken
-            st.divider()
-            
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("Businesses", len(df))
-            with col2:
-                valid_ratings = [r for r in df['Rating'].tolist() if r != "-"]
-                avg_rating = sum(valid_ratings) / len(valid_ratings) if valid_ratings else 0
-                st.metric("Ø Rating", f"{avg_rating:.1f} ⭐")
-            with col3:
-                hot_leads = len(df[df["Lead-Score"] >= 70])
-                st.metric("🔥 Hot Leads", hot_leads)
-            with col4:
-                avg_score = df["Lead-Score"].mean()
-                st.metric("Ø Score", f"{avg_score:.0f}")
-            
-            st.divider()
-            
-            flag_cols = st.columns(4)
-            with flag_cols[0]:
-                reputation_risk = len([r for r in results if "🚨" in r["Flags"]])
-                st.metric("🚨 Reputation Risk", reputation_risk)
-            with flag_cols[1]:
-                response_problem = len([r for r in results if "⏰" in r["Flags"]])
-                st.metric("⏰ Response Problem", response_problem)
-            with flag_cols[2]:
-                high_value = len([r for r in results if "💰" in r["Flags"]])
-                st.metric("💰 High Value", high_value)
-            with flag_cols[3]:
-                high_volume = len([r for r in results if "📊" in r["Flags"]])
-                st.metric("📊 High Volume", high_volume)
-            
-            st.divider()
-            
-            st.subheader("📋 Ergebnisse")
+
+            # Phase 3: Reviews aller Businesses in einem Durchgang analysieren
+            # Nicht geholte Reviews (unter MIN_REVIEWS_FOR_FETCH) -> None, Antwortverhalten unbekannt
+            analysis = analyze_reviews_outscraper([
+                reviews_by_place.get(b["place_id"]) if b.get("place_id") and count > 0 else []
+                for b, count in zip(businesses, review_counts)
+            ])
+            unanswered_pcts = analysis["unanswered_pct"].to_numpy()
+            last_negative_days = analysis["last_negative_days"].to_numpy()
+            answered_labels = np.where(
+                np.isnan(unanswered_pcts),
+                "-",
+                analysis["answered"].astype(str) + "/" + analysis["total"].astype(str)
+            ).astype(object)
             
-            st.markdown("🔥 Hot (70+) · 🟡 Warm (50-69) · 🔵 Cold (30-49) · ⚪ Low (0-29)")
+            # Business-Daten spaltenweise in vorallokierte Arrays
+            names = np.empty(n, dtype=object)
+            ratings = np.empty(n, dtype=np.float32)
+            phones = np.empty(n, dtype=object)
+            websites = np.empty(n, dtype=object)
+            addresses = np.empty(n, dtype=object)
+            maps_urls = np.empty(n, dtype=object)
             
-            def highlight_score(val):
-                if isinstance(val, (int, float)):
-                    if val >= 70:
-                        return 'background-color: #22C55E33; color: #22C55E; font-weight: bold'
-                    elif val >= 50:
-                        return 'background-color: #F59E0B33; color: #F59E0B; font-weight: bold'
-                    elif val >= 30:
-                        return 'background-color: #3B82F633; color: #3B82F6; font-weight: bold'
-                return ''
+            for i, business in enumerate(businesses):
+                names[i] = business.get("name", "Unknown")
+                ratings[i] = business.get("rating", 0) or np.nan
+                phones[i] = business.get("phone", "") or "-"
+                websites[i] = business.get("site", business.get("website", "")) or "-"
+                addresses[i] = business.get("full_address", business.get("address", ""))
+                maps_urls[i] = business.get("google_maps_url", business.get("link", ""))
             
-            display_cols = ["Name", "Rating", "Reviews", "Beantwortet", "Unbeantwortet %", 
-                          "Lead-Score", "Kategorie", "Flags", "Telefon"]
+            # Lead-Score + Pain-Flags für alle Businesses in einem Durchgang
+            branches = np.full(n, branche, dtype=object)
+            breakdown = calculate_lead_scores(
+                ratings,
+                review_counts,
+                unanswered_pcts,
+                last_negative_days,
+                branches
+            )
+            lead_scores = breakdown["final"].to_numpy()
+            flags = get_pain_flags(ratings, unanswered_pcts, breakdown["factor"], review_counts)
             
-            styled_df = df[display_cols].style.applymap(highlight_score, subset=['Lead-Score'])
-            st.dataframe(styled_df, use_container_width=True, hide_index=True)
+            df = pd.DataFrame({
+                "Name": names,
+                "Rating": ratings,
+                "Reviews": review_counts,
+                "Beantwortet": answered_labels,
+                "Unbeantwortet %": unanswered_pcts,  # numerisch, als "67%" formatiert erst in Anzeige/Export
+                "Lead-Score": lead_scores,
+                "Flags": format_pain_flags(flags),
+                "Telefon": phones,
+                "Website": websites,
+                "Adresse": addresses,
+                "Google Maps": maps_urls
+            }, copy=False).join(flags)
             
-            st.divider()
+            df = df.sort_values("Lead-Score", ascending=False, kind="mergesort", ignore_index=True)
             
-            col1, col2 = st.columns(2)
+            categories, score_styles = get_score_categories(df["Lead-Score"])
+            df.insert(df.columns.get_loc("Lead-Score") + 1, "Kategorie", categories)
             
-            with col1:
-                csv = df.to_csv(index=False).encode('utf-8')
-                st.download_button(
-                    label="📥 Als CSV exportieren",
-                    data=csv,
-                    file_name=f"reviewhunter_{branche.lower()}_{location.lower()}_{datetime.now().strftime('%Y%m%d')}.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
+            # Ergebnis merken - spätere Reruns (z.B. Download-Klick) zeigen es ohne neue Suche
+            st.session_state.last_key = search_key
+            st.session_state.last_df = df
+            st.session_state.last_styles = score_styles
             
-            with col2:
-                hot_df = df[df["Lead-Score"] >= 70]
-                if len(hot_df) > 0:
-                    hot_csv = hot_df.to_csv(index=False).encode('utf-8')
-                    st.download_button(
-                        label=f"🔥 Nur Hot Leads ({len(hot_df)})",
-                        data=hot_csv,
-                        file_name=f"reviewhunter_HOT_{branche.lower()}_{location.lower()}_{datetime.now().strftime('%Y%m%d')}.csv",
-                        mime="text/csv",
-                        use_container_width=True
-                    )
+# Ergebnisse der letzten Suche mit denselben Einstellungen
+if st.session_state.get("last_key") == search_key:
+    render_results(st.session_state.last_df, st.session_state.last_styles, branche, location)
 
 # Footer
 st.divider()
-st.markdown("""
-<div style="text-align: center; color: #666; font-size: 0.8rem;">
-    ReviewHunter by ReviewGuard | <a href="https://review-guard.app" target="_blank">review-guard.app</a><br>
-    <small>Powered by Outscraper API</small>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)